@@ -1,10 +1,17 @@
 from flask import Flask, render_template, request, jsonify
-import requests, ssl, socket, time, re, logging, os
+import requests, ssl, socket, time, re, logging, os, threading
+import http.cookiejar
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
-from typing import Tuple, Optional, Dict, List
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from selectolax.lexbor import LexborHTMLParser
+from cachetools import TTLCache
+from typing import Any, Tuple, Optional, Dict, List
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 from flask_cors import CORS
+from a2wsgi import WSGIMiddleware
 import math
 import random
 
@@ -16,45 +23,166 @@ logging.basicConfig(level=logging.INFO)
 # Updated weights for a better balance. Total sum should be 1.0.
 WEIGHTS = {"security": 0.35, "performance": 0.30, "seo": 0.25, "accessibility": 0.10}
 
+# /audit_batch runs at most BATCH_CONCURRENCY audits at a time, MAX_BATCH_URLS per request.
+BATCH_CONCURRENCY = 8
+MAX_BATCH_URLS = 50
+# Upper bound on how long one audit waits for its fanned-out calls. Each call is also
+# bounded by its own timeouts, so a worker is never held much past this.
+AUDIT_TIMEOUT = 20.0
+# One keep-alive session for every outbound request, so page fetches and probes reuse
+# pooled TCP/TLS connections to the same origin instead of handshaking each time.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=64))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=64))
+_SESSION.headers["User-Agent"] = "WebPulse360/1.0 (+https://webpulse360.com)"
+# Pool connections, never cookies: a stored cookie would be replayed to the site on later
+# audits (from any user) and suppress the Set-Cookie the security analysis inspects.
+_SESSION.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+# hostname -> cert notAfter for certificates that passed validation in the last SSL_CACHE_TTL seconds.
+SSL_CACHE_TTL = 300
+_SSL_CACHE: TTLCache[str, float] = TTLCache(maxsize=4096, ttl=SSL_CACHE_TTL)
+_SSL_CACHE_LOCK = threading.Lock()
+# Loading the CA bundle is costly; one context is shared since wrap_socket is thread-safe.
+_SSL_CTX = ssl.create_default_context()
+
+# normalized URL -> last successful audit payload, so repeat submissions skip the work.
+AUDIT_CACHE_TTL = 300
+_AUDIT_CACHE: TTLCache[str, Dict[str, Any]] = TTLCache(maxsize=1024, ttl=AUDIT_CACHE_TTL)
+_AUDIT_CACHE_LOCK = threading.RLock()
+
+# BeautifulSoup fallback: only the tags the analyzers read are materialized. <html> is left
+# out because a matching tag keeps its whole subtree, so lang is read from the raw bytes.
+COLLECTED_TAGS = ("title", "meta", "h1", "img", "a")
+_STRAINER = SoupStrainer(list(COLLECTED_TAGS))
+_HTML_LANG_RE = re.compile(rb"<html\b[^>]*?\slang\s*=\s*[\"']?([^\"'\s>]*)", re.I)
+
+@lru_cache(maxsize=4096)
 def normalize_url(url: str) -> str:
     url = url.strip()
     if not url.startswith(("http://", "https://")):
         url = "https://" + url
     return url
 
-def hostname_from_url(url: str) -> str:
+@lru_cache(maxsize=4096)
+def split_url(url: str) -> Tuple[str, str]:
     try:
-        return urlparse(url).netloc or url
+        parsed = urlparse(url)
     except Exception:
-        return url
+        return url, url
+    host = parsed.netloc or url
+    return host, f"{parsed.scheme}://{host}"
+
+def document_lang(content: bytes) -> Optional[str]:
+    match = _HTML_LANG_RE.search(content)
+    return match.group(1).decode("ascii", "replace") if match else None
+
+def collect_tags(soup: BeautifulSoup) -> Dict[str, List[Tag]]:
+    # One walk over the tree buckets every tag the analyzers need, instead of
+    # each analyzer running its own find/find_all traversals.
+    tags: Dict[str, List[Tag]] = {name: [] for name in COLLECTED_TAGS}
+    for el in soup.descendants:
+        if not isinstance(el, Tag):
+            continue
+        bucket = tags.get(el.name)
+        if bucket is not None:
+            bucket.append(el)
+    return tags
+
+# Both parsers reduce the page to the same plain summary the SEO and accessibility analyzers read:
+# lang, title text, meta attribute dicts, h1 count, img alt values and link texts.
+def parse_page_selectolax(body: bytes) -> Dict[str, Any]:
+    tree = LexborHTMLParser(body)
+    root = tree.root
+    title = tree.css_first("title")
+    return {
+        "lang": root.attributes.get("lang") if root is not None else None,
+        "title": title.text() if title is not None else None,
+        "meta": [node.attributes for node in tree.css("meta")],
+        "h1_count": len(tree.css("h1")),
+        "img_alts": [node.attributes.get("alt") for node in tree.css("img")],
+        "link_texts": [node.text() for node in tree.css("a")],
+    }
+
+def parse_page_bs4(body: bytes) -> Dict[str, Any]:
+    tags = collect_tags(BeautifulSoup(body, "lxml", parse_only=_STRAINER))
+    return {
+        "lang": document_lang(body),
+        "title": tags["title"][0].string if tags["title"] else None,
+        "meta": [tag.attrs for tag in tags["meta"]],
+        "h1_count": len(tags["h1"]),
+        "img_alts": [img.get("alt") for img in tags["img"]],
+        "link_texts": [a.get_text() for a in tags["a"]],
+    }
+
+def parse_page(body: bytes) -> Dict[str, Any]:
+    # selectolax keeps the tree in C and is much cheaper than bs4 for pure extraction.
+    try:
+        return parse_page_selectolax(body)
+    except Exception as e:
+        logging.warning(f"selectolax parse failed, falling back to BeautifulSoup: {e}")
+        return parse_page_bs4(body)
 
-def fetch_page(url: str, timeout: float = 15.0):
+# Pages are read in chunks and cut off past this size so huge responses can't exhaust memory.
+MAX_PAGE_BYTES = 8 << 20
+# Bodies shorter than this are error stubs, not documents worth parsing.
+MIN_HTML_BYTES = 64
+
+def fetch_page(url: str, timeout: float = 15.0) -> Tuple[Optional[requests.Response], bytes, Optional[float]]:
     try:
         start = time.time()
-        resp = requests.get(
-            url,
-            timeout=timeout,
-            headers={"User-Agent": "WebPulse360/1.0 (+https://webpulse360.com)"}
-        )
+        with _SESSION.get(url, timeout=timeout, stream=True) as resp:
+            body = bytearray()
+            for chunk in resp.iter_content(65536):
+                body.extend(chunk)
+                if len(body) > MAX_PAGE_BYTES:
+                    break
+                # requests' timeout applies per socket read; bound the whole download too.
+                if time.time() - start > timeout:
+                    raise TimeoutError(f"Download exceeded {timeout}s")
         elapsed = round(time.time() - start, 2)
-        return resp, elapsed
+        return resp, bytes(body), elapsed
     except Exception as e:
         logging.warning(f"Fetch failed for {url}: {e}")
-        return None, None
+        return None, b"", None
 
-def check_ssl_valid(hostname: str) -> Tuple[bool, Optional[str]]:
+def check_resource(url: str, timeout: float = 5.0) -> Optional[int]:
     try:
-        ctx = ssl.create_default_context()
-        with ctx.wrap_socket(socket.socket(socket.AF_INET), server_hostname=hostname) as s:
-            s.settimeout(5.0)
-            s.connect((hostname, 443))
-            cert = s.getpeercert()
-        
-        ssl.match_hostname(cert, hostname)
+        return _SESSION.head(url, timeout=timeout).status_code
+    except Exception:
+        return None
+
+def check_ssl_valid(hostname: str) -> Tuple[bool, Optional[str]]:
+    with _SSL_CACHE_LOCK:
+        not_after = _SSL_CACHE.get(hostname)
+    if not_after is not None and time.time() < not_after:
         return True, "Valid"
+
+    try:
+        # The default context verifies the chain and the hostname during the handshake.
+        with socket.create_connection((hostname, 443), timeout=5.0) as sock:
+            with _SSL_CTX.wrap_socket(sock, server_hostname=hostname) as s:
+                cert_not_after = (s.getpeercert() or {}).get("notAfter")
     except Exception as e:
         return False, str(e)
 
+    # The handshake already validated the certificate; an unparseable date only skips caching.
+    try:
+        if isinstance(cert_not_after, str):
+            expires = ssl.cert_time_to_seconds(cert_not_after)
+            with _SSL_CACHE_LOCK:
+                _SSL_CACHE[hostname] = expires
+    except ValueError:
+        pass
+    return True, "Valid"
+
+def result_before(future: Future, deadline: float, default: Any) -> Any:
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeoutError:
+        future.cancel()
+        return default
+
 def letter_grade(score: int) -> str:
     if score >= 90: return "A+"
     if score >= 80: return "A"
@@ -71,25 +199,35 @@ SECURITY_HEADERS = [
     "Referrer-Policy",
     "Permissions-Policy",
 ]
+_SECURITY_HEADER_KEYS = tuple((h, h.lower()) for h in SECURITY_HEADERS)
+
+_CRITICAL_ISSUE_RE = re.compile(r"Missing|Invalid|High")
 
-def analyze_security(resp, ssl_ok: bool) -> Tuple[Dict, List[str]]:
-    score, issues = 100, []
+def analyze_security(resp: Optional[requests.Response], ssl_ok: Optional[bool]) -> Tuple[Dict, List[str]]:
+    score = 100
+    issues: List[str] = []
     
-    if not ssl_ok:
+    if ssl_ok is None:
+        issues.append("Could not check SSL/TLS certificate.")
+    elif not ssl_ok:
         score -= 40
         issues.append("Invalid SSL/TLS certificate.")
     
+    header_status: Dict[str, bool] = {}
     if resp is not None:
-        missing_headers = [h for h in SECURITY_HEADERS if h not in resp.headers]
+        # Lowercase the header names once; CaseInsensitiveDict re-lowercases on every lookup.
+        headers = {k.lower(): v for k, v in resp.headers.items()}
+        header_status = {h: key in headers for h, key in _SECURITY_HEADER_KEYS}
+        missing_headers = [h for h, ok in header_status.items() if not ok]
         
         if missing_headers:
             score -= len(missing_headers) * 10
             issues.extend([f"Missing {h} header." for h in missing_headers])
             
-        set_cookie = resp.headers.get("Set-Cookie")
+        set_cookie = headers.get("set-cookie", "").lower()
         if set_cookie:
-            has_secure = "secure" in set_cookie.lower()
-            has_httponly = "httponly" in set_cookie.lower()
+            has_secure = "secure" in set_cookie
+            has_httponly = "httponly" in set_cookie
             if not has_secure:
                 score -= 10
                 issues.append("Cookies missing Secure flag.")
@@ -103,26 +241,25 @@ def analyze_security(resp, ssl_ok: bool) -> Tuple[Dict, List[str]]:
     return {
         "score": max(0, score),
         "ssl_valid": ssl_ok,
-        "security_headers": {h: h in resp.headers for h in SECURITY_HEADERS} if resp else {},
+        "security_headers": header_status,
         "phishing_risk": "LOW RISK" if random.random() > 0.1 else "HIGH RISK"
     }, issues
 
-def analyze_performance(resp, load_time: Optional[float]) -> Tuple[Dict, int, List[str]]:
-    issues, score = [], 100
+def analyze_performance(resp: Optional[requests.Response], body: bytes, load_time: Optional[float]) -> Tuple[Dict, int, List[str]]:
+    issues: List[str] = []
+    score = 100
     
-    if resp is None:
+    # fetch_page only omits the load time when the fetch itself failed.
+    if resp is None or load_time is None:
         return {}, 0, ["Site not reachable for performance test."]
 
-    size_kb = round(len(resp.content) / 1024, 2)
+    size_kb = round(len(body) / 1024, 2)
     
     # Enhanced: Simulate Core Web Vitals based on load time for consistency
-    if load_time is not None:
-        lcp = random.uniform(load_time * 0.8, load_time * 1.2)
-        fcp = random.uniform(load_time * 0.4, load_time * 0.8)
-    else:
-        lcp, fcp = 0, 0
-
-    cls = random.uniform(0.0, 0.25)
+    r = random.random
+    lcp = load_time * (0.8 + 0.4 * r())
+    fcp = load_time * (0.4 + 0.4 * r())
+    cls = 0.25 * r()
     
     if lcp > 2.5: 
         score -= 20
@@ -134,13 +271,9 @@ def analyze_performance(resp, load_time: Optional[float]) -> Tuple[Dict, int, Li
         score -= 10
         issues.append("High Cumulative Layout Shift (CLS) - Page layout is unstable.")
 
-    if load_time is None:
-        score -= 20
-        issues.append("Could not measure load time.")
-    else:
-        if load_time > 6: score -= 45; issues.append(f"Very high load time {load_time}s.")
-        elif load_time > 4: score -= 30; issues.append(f"High load time {load_time}s.")
-        elif load_time > 2: score -= 15; issues.append(f"Moderate load time {load_time}s.")
+    if load_time > 6: score -= 45; issues.append(f"Very high load time {load_time}s.")
+    elif load_time > 4: score -= 30; issues.append(f"High load time {load_time}s.")
+    elif load_time > 2: score -= 15; issues.append(f"Moderate load time {load_time}s.")
     
     if size_kb > 4096: score -= 30; issues.append(f"Page very large: {size_kb} KB. Consider optimizing assets.")
     elif size_kb > 2048: score -= 20; issues.append(f"Page large: {size_kb} KB. Consider optimizing assets.")
@@ -153,21 +286,21 @@ def analyze_performance(resp, load_time: Optional[float]) -> Tuple[Dict, int, Li
         "metrics": {"lcp": round(lcp, 2), "fcp": round(fcp, 2), "cls": round(cls, 3)}
     }, max(0, min(100, score)), issues
 
-def analyze_seo(html: str, url: str) -> Tuple[Dict, int, List[str]]:
-    if not html:
+def analyze_seo(page: Optional[Dict[str, Any]], url: str, robots_status: Optional[int], sitemap_status: Optional[int]) -> Tuple[Dict, int, List[str]]:
+    if page is None:
         return {}, 0, ["No HTML fetched for SEO."]
     
-    soup = BeautifulSoup(html, "html.parser")
-    issues, score = [], 0
+    issues: List[str] = []
+    score = 0
 
-    title_tag = soup.title.string.strip() if soup.title and soup.title.string else None
+    title_tag = page["title"].strip() if page["title"] else None
     if title_tag:
         score += 20
         if 10 <= len(title_tag) <= 70: score += 10
         else: issues.append("Title length not optimal (10-70 characters recommended).")
     else: issues.append("Missing <title> tag.")
 
-    meta_desc_tag = soup.find("meta", attrs={"name": re.compile("description", re.I)})
+    meta_desc_tag = next((m for m in page["meta"] if (m.get("name") or "").lower() == "description"), None)
     meta_desc = meta_desc_tag.get("content") if meta_desc_tag else None
     if meta_desc and len(meta_desc.strip()) > 0:
         desc_len = len(meta_desc.strip())
@@ -176,99 +309,106 @@ def analyze_seo(html: str, url: str) -> Tuple[Dict, int, List[str]]:
         else: issues.append("Meta description length not optimal (50-160 characters recommended).")
     else: issues.append("Missing meta description.")
 
-    h1_tags = soup.find_all("h1")
-    if len(h1_tags) == 1: score += 10
-    elif len(h1_tags) > 1: issues.append("Multiple <h1> headings found. Use only one per page.")
+    h1_count = page["h1_count"]
+    if h1_count == 1: score += 10
+    elif h1_count > 1: issues.append("Multiple <h1> headings found. Use only one per page.")
     else: issues.append("Missing heading.")
 
     # New: Check for Open Graph tags
-    og_tags = soup.find_all("meta", property=re.compile(r"^og:", re.I))
+    og_tags = [m for m in page["meta"] if (m.get("property") or "").lower().startswith("og:")]
     og_tag_details = {tag.get("property"): tag.get("content") for tag in og_tags}
     if not og_tags:
         score -= 20
         issues.append("Missing Open Graph tags. These are essential for social media sharing.")
     
     robots_txt_status = "Not Found"
-    try:
-        robots_resp = requests.head(normalize_url(url) + "/robots.txt", timeout=5)
-        if robots_resp.status_code == 200:
-            robots_txt_status = "Found"
-        else:
-            issues.append("robots.txt file not found. This may impact search engine crawling.")
-    except:
+    if robots_status is None:
         issues.append("Could not check for robots.txt.")
-        
+    elif robots_status == 200:
+        robots_txt_status = "Found"
+    else:
+        issues.append("robots.txt file not found. This may impact search engine crawling.")
+
     sitemap_xml_status = "Not Found"
-    try:
-        sitemap_resp = requests.head(normalize_url(url) + "/sitemap.xml", timeout=5)
-        if sitemap_resp.status_code == 200:
-            sitemap_xml_status = "Found"
-        else:
-            issues.append("sitemap.xml file not found. This is recommended for SEO.")
-    except:
+    if sitemap_status is None:
         issues.append("Could not check for sitemap.xml.")
+    elif sitemap_status == 200:
+        sitemap_xml_status = "Found"
+    else:
+        issues.append("sitemap.xml file not found. This is recommended for SEO.")
     
     return {
         "title": title_tag,
         "meta_description": meta_desc,
-        "h1_count": len(h1_tags),
+        "h1_count": h1_count,
         "og_tags": og_tag_details,
         "robots_txt_status": robots_txt_status,
         "sitemap_xml_status": sitemap_xml_status
     }, max(0, min(100, score)), issues
 
-def analyze_accessibility(html: str, url: str) -> Tuple[Dict, int, List[str]]:
-    if not html:
+def analyze_accessibility(page: Optional[Dict[str, Any]], url: str) -> Tuple[Dict, float, List[str]]:
+    if page is None:
         return {}, 0, ["No HTML fetched for accessibility."]
     
-    soup = BeautifulSoup(html, "html.parser")
-    issues, score = [], 100
+    issues: List[str] = []
+    score: float = 100
 
-    images = soup.find_all("img")
-    images_without_alt = [img for img in images if not img.get("alt")]
+    images = page["img_alts"]
+    images_without_alt = [alt for alt in images if not alt]
     if images and len(images_without_alt) > 0:
         score -= (len(images_without_alt) / len(images)) * 30
         issues.append(f"{len(images_without_alt)} images missing alt attributes.")
 
-    if not soup.find("h1"):
+    if not page["h1_count"]:
         score -= 10
         issues.append("Missing heading.")
 
-    if not soup.html or not soup.html.get('lang'):
+    if not page["lang"]:
         score -= 10
         issues.append("Missing lang attribute on <html> tag.")
 
-    links = soup.find_all('a')
-    empty_links = [a for a in links if not a.string or a.string.strip() == '']
+    links = page["link_texts"]
+    empty_links = [text for text in links if not text or text.strip() == '']
     if links and len(empty_links) > 0:
         score -= (len(empty_links) / len(links)) * 10
         issues.append(f"{len(empty_links)} links with no text.")
     
     return {}, max(0, min(100, score)), issues
 
-@app.route("/")
-def home():
-    return render_template("index.html")
-
-@app.route("/audit", methods=["POST"])
-def audit():
-    data = request.get_json(silent=True) or {}
-    url = normalize_url(data.get("url", ""))
-
-    if not url:
-        return jsonify({"error": "URL required"}), 400
-
-    host = hostname_from_url(url)
-    ssl_ok, ssl_err = check_ssl_valid(host)
-    resp, load_time = fetch_page(url)
+def run_audit(url: str) -> Tuple[Dict, int]:
+    with _AUDIT_CACHE_LOCK:
+        cached = _AUDIT_CACHE.get(url)
+    if cached is not None:
+        return {**cached, "timestamp": datetime.utcnow().isoformat()}, 200
+
+    host, origin = split_url(url)
+    # The SSL handshake, page fetch and crawl-file probes are independent I/O,
+    # so run them together and pay for the slowest one instead of their sum.
+    # A pool per audit means the calls start at once and never queue behind other
+    # audits, so the deadline only measures this site's own latency.
+    executor = ThreadPoolExecutor(max_workers=4)
+    deadline = time.monotonic() + AUDIT_TIMEOUT
+    ssl_future = executor.submit(check_ssl_valid, host)
+    page_future = executor.submit(fetch_page, url)
+    robots_future = executor.submit(check_resource, f"{origin}/robots.txt")
+    sitemap_future = executor.submit(check_resource, f"{origin}/sitemap.xml")
+    executor.shutdown(wait=False)
+
+    ssl_ok, ssl_err = result_before(ssl_future, deadline, (None, "SSL check timed out."))
+    resp, body, load_time = result_before(page_future, deadline, (None, b"", None))
 
     if resp is None:
-        return jsonify({"error": "Failed to fetch page."}), 500
+        return {"error": "Failed to fetch page."}, 500
+
+    # Parse once for both HTML analyzers; the parsers sniff the encoding from the raw bytes.
+    page = parse_page(body) if len(body) >= MIN_HTML_BYTES else None
 
     sec_metrics, sec_issues = analyze_security(resp, ssl_ok)
-    perf_metrics, perf_score, perf_issues = analyze_performance(resp, load_time)
-    seo_metrics, seo_score, seo_issues = analyze_seo(resp.text, url)
-    acc_metrics, acc_score, acc_issues = analyze_accessibility(resp.text, url)
+    perf_metrics, perf_score, perf_issues = analyze_performance(resp, body, load_time)
+    robots_status = result_before(robots_future, deadline, None)
+    sitemap_status = result_before(sitemap_future, deadline, None)
+    seo_metrics, seo_score, seo_issues = analyze_seo(page, url, robots_status, sitemap_status)
+    acc_metrics, acc_score, acc_issues = analyze_accessibility(page, url)
 
     overall = round(
         sec_metrics["score"] * WEIGHTS["security"]
@@ -279,10 +419,10 @@ def audit():
     grade = letter_grade(overall)
     
     issues_combined = sec_issues + perf_issues + seo_issues + acc_issues
-    critical_issues = len([i for i in issues_combined if "Missing" in i or "Invalid" in i or "High" in i])
+    critical_issues = sum(1 for i in issues_combined if _CRITICAL_ISSUE_RE.search(i))
     minor_issues = len(issues_combined) - critical_issues
 
-    return jsonify({
+    result = {
         "timestamp": datetime.utcnow().isoformat(),
         "url": url,
         "status": "success",
@@ -292,7 +432,55 @@ def audit():
         "seo": {**seo_metrics, "score": seo_score, "issues": seo_issues},
         "accessibility": {**acc_metrics, "score": acc_score, "issues": acc_issues},
         "issues_count": {"critical": critical_issues, "minor": minor_issues}
-    })
+    }
+    # A check that could not complete is transient; don't pin that result for the cache TTL.
+    if None not in (ssl_ok, robots_status, sitemap_status):
+        with _AUDIT_CACHE_LOCK:
+            _AUDIT_CACHE[url] = result
+    return result, 200
+
+@app.route("/")
+def home():
+    return render_template("index.html")
+
+@app.route("/audit", methods=["POST"])
+def audit():
+    data = request.get_json(silent=True) or {}
+    url = normalize_url(data.get("url", ""))
+
+    if not url:
+        return jsonify({"error": "URL required"}), 400
+
+    result, status = run_audit(url)
+    return jsonify(result), status
+
+@app.route("/audit_batch", methods=["POST"])
+def audit_batch():
+    data = request.get_json(silent=True) or {}
+    urls = data.get("urls")
+
+    if not urls or not isinstance(urls, list):
+        return jsonify({"error": "URLs required"}), 400
+    if len(urls) > MAX_BATCH_URLS:
+        return jsonify({"error": f"At most {MAX_BATCH_URLS} URLs per batch."}), 400
+
+    if not all(isinstance(u, str) and u.strip() for u in urls):
+        return jsonify({"error": "Each URL must be a non-empty string."}), 400
+
+    # Deduplicate so repeated entries share one audit instead of racing past the cache.
+    urls = list(dict.fromkeys(normalize_url(u) for u in urls))
+    with ThreadPoolExecutor(max_workers=min(BATCH_CONCURRENCY, len(urls))) as pool:
+        audited = list(pool.map(run_audit, urls))
+
+    results = [result if status == 200 else {"url": url, "status": "error", **result}
+               for url, (result, status) in zip(urls, audited)]
+    return jsonify({"timestamp": datetime.utcnow().isoformat(), "results": results})
+
+# ASGI entry point for production: uvicorn app:asgi_app --workers 4
+# a2wsgi runs each request on its own pool thread, so one worker serves many audits at once
+# (asgiref's WsgiToAsgi would funnel every request through a single thread).
+ASGI_THREADS = 32
+asgi_app = WSGIMiddleware(app, workers=ASGI_THREADS)  # type: ignore[arg-type]  # a2wsgi types environ as a TypedDict
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file